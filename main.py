@@ -1,13 +1,18 @@
 import streamlit as st
-import seaborn as sns
-import matplotlib.pyplot as plt
-import matplotlib.lines as mlines
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from functools import cached_property, reduce
+from types import MappingProxyType
 import requests
-from bs4 import BeautifulSoup, Comment
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from io import StringIO
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Configuración general de la app
@@ -16,6 +21,44 @@ st.set_page_config(page_title="Análisis FBref - La Liga", page_icon="⚽", layo
 # Título principal
 st.title("📊 FBREF Scraper y Análisis de los Jugadores en La Liga 2024-25")
 
+# Cabeceras HTTP usadas en las peticiones a FBref
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"}
+
+# Sesión HTTP compartida: reutiliza las conexiones (keep-alive) con fbref.com, pide las páginas
+# comprimidas y reintenta ante errores temporales o límites de peticiones
+SESSION = requests.Session()
+SESSION.headers.update({**HEADERS, "Accept-Encoding": "gzip, deflate"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+
+# Temporadas disponibles en FBref para todas las ligas, de la más reciente a la más antigua
+TEMPORADAS = ('2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021')
+
+
+@dataclass(frozen=True, slots=True)
+class League:
+    """
+    Datos de una liga de FBref: su ID, el slug usado en la URL y las temporadas disponibles.
+    """
+    id: object
+    slug: str
+    seasons: tuple = TEMPORADAS
+
+
+# Ligas disponibles en FBref. Es inmutable y se define una sola vez a nivel de módulo
+LIGAS_FBREF = MappingProxyType({
+    'Premier League': League(9, 'Premier-League'),
+    'La Liga': League(12, 'La-Liga'),
+    'Ligue 1': League(13, 'Ligue-1'),
+    'Bundesliga': League(20, 'Bundesliga'),
+    'Serie A': League(11, 'Serie-A'),
+    'Big 5 European Leagues': League('Big5', 'Big-5-European-Leagues'),
+})
+
 
 class LeagueManager:
     """
@@ -26,41 +69,8 @@ class LeagueManager:
         Inicializa los atributos necesarios para acceder a las ligas, temporadas y tipos de estadísticas disponibles.
         """
         self.base_url = "https://fbref.com/en/comps/"
-        # Diccionario con ligas disponibles, cada una con su ID, slug para la URL y temporadas disponibles
-        self.possible_leagues = {
-            'Fbref': {
-                'Premier League': {
-                    'id': 9,
-                    'slug': 'Premier-League',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']
-                },
-                'La Liga': {
-                    'id': 12,
-                    'slug': 'La-Liga',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']
-                },
-                'Ligue 1': {
-                    'id': 13,
-                    'slug': 'Ligue-1',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']    
-                },
-                'Bundesliga': {
-                    'id': 20,
-                    'slug': 'Bundesliga',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']
-                },
-                'Serie A': {
-                    'id': 11,
-                    'slug': 'Serie-A',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']
-                },
-                'Big 5 European Leagues': {
-                    'id': 'Big5',
-                    'slug': 'Big-5-European-Leagues',
-                    'seasons': ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021']
-                },
-            }
-        }
+        # Ligas disponibles, compartidas por todas las instancias (ver `LIGAS_FBREF`)
+        self.possible_leagues = LIGAS_FBREF
 
         # Tipos de estadísticas disponibles para jugadores
         self.player_tables = {
@@ -86,10 +96,10 @@ class LeagueManager:
         """
         return {
             league_name: {
-                'id': data['id'],
-                'seasons': data['seasons']
+                'id': league.id,
+                'seasons': league.seasons
             }
-            for league_name, data in self.possible_leagues['Fbref'].items()
+            for league_name, league in self.possible_leagues.items()
         }
 
     def get_league_info(self, league_name):
@@ -100,9 +110,9 @@ class LeagueManager:
             league_name (str): Nombre de la liga.
 
         Return:
-            dict or None: Información de la liga seleccionada (id, slug, seasons) o None si no existe.
+            League or None: Información de la liga seleccionada (id, slug, seasons) o None si no existe.
         """
-        return self.possible_leagues['Fbref'].get(league_name)
+        return self.possible_leagues.get(league_name)
 
     def get_all_league_names(self):
         """
@@ -111,35 +121,58 @@ class LeagueManager:
         Return:
             list: Nombres de las ligas.
         """
-        return list(self.possible_leagues['Fbref'].keys())
+        return list(self.possible_leagues.keys())
 
-    def generate_player_urls(self):
+    @cached_property
+    def player_urls(self):
         """
-        Genera URLs completas para acceder a estadísticas de jugadores por liga, temporada y tipo de estadística.
+        Árbol de URLs de estadísticas de jugadores. Se construye una sola vez por instancia,
+        usando el slug precalculado de cada liga en lugar de recalcularlo para cada URL.
 
         Return:
             dict: Diccionario anidado con URLs organizadas por liga y temporada.
                   Formato: {liga: {temporada: {tipo_estadistica: url}}}
         """
-        urls = {}
+        return {
+            league_name: {
+                season: {
+                    stat_name: f"{self.base_url}{league.id}/{path}/{season}/{league.slug}-Stats"
+                    for stat_name, path in self.player_tables.items()
+                }
+                for season in league.seasons
+            }
+            for league_name, league in self.possible_leagues.items()
+        }
+
+    def generate_player_urls(self):
+        """
+        Genera URLs completas para acceder a estadísticas de jugadores por liga, temporada y tipo de estadística.
+        Las URLs se calculan bajo demanda al acceder a ellas; el árbol completo sigue disponible en `player_urls`.
+
+        Return:
+            PlayerURLs: Vista indexable por (liga, temporada, tipo_estadistica) que devuelve la URL.
+        """
+        return PlayerURLs(self)
 
-        for league_name, league_data in self.possible_leagues['Fbref'].items():
-            league_id = league_data['id']
-            seasons = league_data['seasons']
-            urls[league_name] = {}
 
-            for season in seasons:
-                season_urls = {}
-                for stat_name, path in self.player_tables.items():
-                    url = (
-                        f"{self.base_url}{league_id}/{path}/{season}/"
-                        f"{league_name.replace(' ', '-')}-Stats"
-                    )
-                    season_urls[stat_name] = url
+class PlayerURLs:
+    """
+    Vista perezosa de las URLs de estadísticas de jugadores de un `LeagueManager`:
+    `urls[liga, temporada, tipo_estadistica]` construye solo la URL pedida.
+    """
+    __slots__ = ('_manager',)
+
+    def __init__(self, manager):
+        self._manager = manager
 
-                urls[league_name][season] = season_urls
+    def __getitem__(self, key):
+        league_name, season, stat = key
+        league = self._manager.possible_leagues[league_name]
+        if season not in league.seasons:
+            raise KeyError(season)
+        path = self._manager.player_tables[stat]
+        return f"{self._manager.base_url}{league.id}/{path}/{season}/{league.slug}-Stats"
 
-        return urls
 
 def format_dataframe_columns(df, stat_category):
     """
@@ -156,26 +189,20 @@ def format_dataframe_columns(df, stat_category):
     # Verifica si las columnas del DataFrame tienen múltiples niveles (MultiIndex)
     if isinstance(df.columns, pd.MultiIndex):
         # Si tienen múltiples niveles, crea nombres planos combinando el segundo nivel (nombre de columna)
-        # con el primero (categoría), junto con el sufijo proporcionado por stat_category
-        df.columns = [f"{col[1]} ({col[0]} - {stat_category})" for col in df.columns]
+        # con el primero (categoría), junto con el sufijo proporcionado por stat_category.
+        # Se concatenan los niveles completos como pd.Index en lugar de formatear columna a columna
+        nivel_categoria = df.columns.get_level_values(0).astype(str)
+        nivel_nombre = df.columns.get_level_values(1).astype(str)
+        df.columns = nivel_nombre + " (" + nivel_categoria + " - " + stat_category + ")"
     else:
         # Si las columnas no son multinivel, simplemente añade el sufijo con stat_category a cada nombre
-        df.columns = [f"{col} ({stat_category})" for col in df.columns]
+        df.columns = df.columns.astype(str) + f" ({stat_category})"
     # Devuelve el DataFrame con los nuevos nombres de columnas
     return df
 
-def formatear_datos(df):
-    """
-    Renombra las columnas de un DataFrame de estadísticas futbolísticas avanzadas 
-    obtenidas de FBref, mapeando los nombres técnicos largos a versiones más comprensibles en español.
-    Posteriormente se hace la limpieza de las columnas para que sean más legibles y útiles.
-    Args:
-        df (pd.DataFrame): DataFrame con las estadísticas originales de FBref.
-    Returns:
-        pd.DataFrame: DataFrame con las columnas renombradas y procesadas.
-
-    """
-    mapeo_columns= {
+# Mapeo de los nombres de columnas de FBref (ya aplanados) a nombres legibles en español.
+# Se define una sola vez a nivel de módulo y de solo lectura para no reconstruirlo en cada llamada.
+MAPEO_COLUMNS = MappingProxyType({
     'Player (Unnamed: 1_level_0 - Standard Stats)': 'Player',
     'Nation (Unnamed: 2_level_0 - Standard Stats)': 'Nacionalidad',
     'Pos (Unnamed: 3_level_0 - Standard Stats)': 'Posicion',
@@ -446,24 +473,76 @@ def formatear_datos(df):
        '#OPA (Sweeper - Advanced Goalkeeping)':'Acciones defensivas fuera area penalti',
        '#OPA/90 (Sweeper - Advanced Goalkeeping)':'Acciones defensivas fuera area penalti/90',
        'AvgDist (Sweeper - Advanced Goalkeeping)':'Promedio de distancia Acc. def. fuera area penalti'  
-       
-        }
-    df.columns = [mapeo_columns[col] if col in mapeo_columns else col for col in df.columns]
+})
+
+# Expresiones regulares precompiladas para la limpieza de columnas en `formatear_datos`
+PATRON_NACIONALIDAD = re.compile(r'([A-Z]+)$')
+PATRON_COMPETICION = re.compile(r'\s(.+)')
+
+def transformar_por_categorias(serie, transformacion):
+    """
+    Aplica una transformación de texto solo sobre los valores únicos de una columna (sus categorías)
+    y la propaga a todas las filas. Columnas como la nacionalidad o la competición tienen pocas
+    decenas de valores distintos frente a cientos de filas.
+
+    Args:
+        serie (pd.Series): Columna a transformar.
+        transformacion (callable): Función que recibe las categorías (pd.Index de strings) y devuelve
+                                   los valores transformados en el mismo orden.
+
+    Returns:
+        pd.Series: Columna transformada, con el mismo índice que la original.
+    """
+    categorias = serie.astype(str).astype('category')
+    valores = np.asarray(transformacion(categorias.cat.categories), dtype=object)
+    return pd.Series(valores[categorias.cat.codes.to_numpy()], index=serie.index)
+
+@st.cache_data(show_spinner=False)
+def formatear_datos(df):
+    """
+    Renombra las columnas de un DataFrame de estadísticas futbolísticas avanzadas 
+    obtenidas de FBref, mapeando los nombres técnicos largos a versiones más comprensibles en español.
+    Posteriormente se hace la limpieza de las columnas para que sean más legibles y útiles.
+    Args:
+        df (pd.DataFrame): DataFrame con las estadísticas originales de FBref.
+    Returns:
+        pd.DataFrame: DataFrame con las columnas renombradas y procesadas.
+
+    """
+    df = df.rename(columns=MAPEO_COLUMNS)
 
     
     # Procesar columnas después de renombrarlas
     if 'Nacionalidad' in df.columns:
         # Extraer la nacionalidad de la columna 'Nacionalidad'
-        df["Nacionalidad"] = df["Nacionalidad"].astype(str).str.extract(r'([A-Z]+)$')
+        df["Nacionalidad"] = transformar_por_categorias(df["Nacionalidad"], lambda c: c.str.extract(PATRON_NACIONALIDAD, expand=False))
     if "Edad" in df.columns:
     # Extraer la edad de la columna 'Edad' y convertirla a string
-        df["Edad"] = df["Edad"].astype(str).str.split('-').str[0]
+        df["Edad"] = transformar_por_categorias(df["Edad"], lambda c: c.str.split('-', n=1).str[0])
     if "Competicion" in df.columns:
         # Extraer la competición de la columna 'Competicion'
-        df["Competicion"] = df["Competicion"].astype(str).str.extract(r'\s(.+)')
+        df["Competicion"] = transformar_por_categorias(df["Competicion"], lambda c: c.str.extract(PATRON_COMPETICION, expand=False))
+
+    # Reducir el tamaño en memoria: cada columna numérica al tipo más pequeño que representa sus valores
+    # (se recorre por posición porque algunas tablas tienen nombres de columna repetidos)
+    for i, dtype in enumerate(df.dtypes):
+        if pd.api.types.is_float_dtype(dtype):
+            df.isetitem(i, pd.to_numeric(df.iloc[:, i], downcast='float'))
+        elif pd.api.types.is_integer_dtype(dtype):
+            df.isetitem(i, pd.to_numeric(df.iloc[:, i], downcast='integer'))
+
+    # Columnas de texto con pocos valores distintos como categorías
+    for columna in ('Nacionalidad', 'Equipo', 'Competicion'):
+        if columna in df.columns:
+            df[columna] = df[columna].astype('category')
+
+    # El nombre del jugador es prácticamente único por fila: se guarda como cadena de Arrow (contigua en memoria)
+    if 'Player' in df.columns:
+        df['Player'] = df['Player'].astype('string[pyarrow]')
 
     return df
 
+@st.cache_data(show_spinner=False)
 def procesar_posiciones(df, columna='Posicion'):
     """
     Procesa la columna de posiciones dividiéndola en 'Posicion_principal' y 'Posicion_2',
@@ -485,141 +564,344 @@ def procesar_posiciones(df, columna='Posicion'):
         'GK': 'Goalkeeper'
     }
 
-    df = df.copy()
-
-    # Separar y mapear
-    df['Posicion_principal'] = df[columna].str[:2].replace(mapping)
-    df['Posicion_2'] = df[columna].str[3:].replace(mapping)
+    # Separar y mapear solo las combinaciones distintas de posiciones (categorías), no cada fila
+    posiciones = df[columna].astype('category')
+    categorias = posiciones.cat.categories.to_series()
+    # El código -1 de las posiciones nulas apunta al NaN añadido al final
+    codigos = posiciones.cat.codes.to_numpy()
+    principal = np.append(categorias.str[:2].replace(mapping).to_numpy(dtype=object), np.nan)
+    secundaria = np.append(categorias.str[3:].replace(mapping).to_numpy(dtype=object), np.nan)
 
-    # Eliminar columna original
+    # Eliminar columna original (el drop ya devuelve un DataFrame nuevo, sin necesidad de copiarlo antes)
     df = df.drop(columns=[columna])
+    df['Posicion_principal'] = pd.Categorical(principal[codigos])
+    df['Posicion_2'] = pd.Categorical(secundaria[codigos])
 
     return df
 
+@st.cache_data(show_spinner=False)
+def separar_por_posicion(df):
+    """
+    Divide el DataFrame de jugadores en un DataFrame por posición principal, con la columna
+    'Posicion_2' ya limpia ('No encontrado' cuando el jugador no tiene posición secundaria).
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Posicion_principal' y 'Posicion_2'.
+
+    Returns:
+        dict: DataFrame de cada posición principal, con el índice reiniciado.
+    """
+    posiciones = {}
+    for posicion, df_posicion in df.groupby('Posicion_principal', sort=False, observed=True):
+        # Cada grupo ya es un DataFrame nuevo (no una vista del original): se reetiqueta el índice
+        # en el sitio en lugar de reset_index, que volvería a copiar todas las columnas
+        df_posicion.index = pd.RangeIndex(len(df_posicion))
+        # Limpieza vectorizada de 'Posicion_2' para evitar valores nulos o vacíos
+        secundaria = df_posicion['Posicion_2'].astype(object).fillna('')
+        df_posicion['Posicion_2'] = np.where(secundaria.str.strip() != '', secundaria, 'No encontrado')
+        posiciones[posicion] = df_posicion
+    return posiciones
+
+# Traducción al castellano de las posiciones principales que se muestran en el selector de análisis
+TRADUCCION_POSICIONES = MappingProxyType({
+    'Midfielder': 'Centrocampista',
+    'Defender': 'Defensa',
+    'Forward': 'Delantero',
+    'Goalkeeper': 'Portero',
+    # añade más si tu DataFrame incluye otros
+})
+# Traducción inversa (castellano -> inglés) para recuperar la posición original seleccionada
+POSICIONES_POR_TRADUCCION = MappingProxyType({v: k for k, v in TRADUCCION_POSICIONES.items()})
+
+@st.cache_resource(show_spinner=False)
+def get_manager():
+    """
+    Devuelve una única instancia de `LeagueManager` compartida por todas las sesiones y reruns
+    del proceso de Streamlit. Al no copiarse en cada llamada (a diferencia de `st.cache_data`),
+    no se vuelve a crear en cada rerun.
+
+    Return:
+        LeagueManager: Gestor de ligas compartido.
+    """
+    return LeagueManager()
+
 #Llamada a la clase LeagueManager para generar URLs de jugadores
-manager = LeagueManager()
+manager = get_manager()
 player_urls = manager.generate_player_urls()
-# Ver las URLs de La Liga 2024-2025
-for stat, url in player_urls['La Liga']['2024-2025'].items():
-    print(stat, "->", url)
 
 
 def scrape_stats_player(league ='Premier League', season= '2024-2025',stat= 'Goalkeeping',team_type="players"):
     
-     # Accedemos al diccionario de URLs
-    league_data = player_urls[league]
+     # Accedemos a los datos de la liga
+    league_data = manager.possible_leagues[league]
         
     # Verificamos si la temporada existe en la liga
-    if season not in league_data:
+    if season not in league_data.seasons:
         raise ValueError(f"La temporada '{season}' no está disponible para la liga '{league}'.")
 
-    # Accedemos a las URLs de la temporada
-    season_data = league_data[season]
+    # Devolvemos la URL correspondiente, construida solo para esta liga, temporada y estadística
+    return player_urls[league, season, stat]
 
-    # Devolvemos la URL correspondiente
-    return season_data[stat]
 
+# Id de la tabla de jugadores de cada tipo de estadística en las páginas de FBref
+STAT_TABLE_IDS = {
+    "Standard Stats": "stats_standard",
+    "Goalkeeping": "stats_keeper",
+    "Advanced Goalkeeping": "stats_keeper_adv",
+    "Shooting": "stats_shooting",
+    "Passing": "stats_passing",
+    "Pass Types": "stats_passing_types",
+    "Goal and Shot Creation": "stats_gca",
+    "Defensive Actions": "stats_defense",
+    "Possession": "stats_possession",
+    "Playing Time": "stats_playing_time",
+    "Miscellaneous Stats": "stats_misc",
+}
 
-def extract_tables(league='La Liga', season='2024-2025', stat='Goalkeeping', save_excel=False):
+# Marcadores de comentario HTML con los que FBref oculta parte de sus tablas
+PATRON_COMENTARIOS = re.compile(r'<!--|-->')
+
+# Columnas de las tablas de FBref que se descartan: el enlace a los partidos ('Matches') y el ranking ('Rk')
+PATRON_COLUMNAS_DESCARTADAS = re.compile(r'matches|Rk', re.IGNORECASE)
+
+# Caché en disco de las tablas ya procesadas. Las temporadas pasadas de FBref no cambian y no caducan;
+# la temporada en curso se vuelve a descargar cuando su fichero tiene más de un día
+CACHE_DIR = Path("cache")
+TEMPORADA_ACTUAL = TEMPORADAS[0]
+CACHE_EDAD_MAXIMA_ACTUAL = 24 * 3600  # segundos
+
+
+def ruta_cache(league, season, stat):
+    """
+    Construye la ruta del fichero parquet de una tabla de FBref.
+
+    Args:
+        league (str): Liga de la tabla.
+        season (str): Temporada de la tabla.
+        stat (str): Tipo de estadística.
+
+    Returns:
+        Path: Ruta del fichero dentro de `CACHE_DIR`.
+    """
+    return CACHE_DIR / f"{league}_{season}_{stat}.parquet".replace(' ', '_')
+
+
+def leer_cache_parquet(league, season, stat):
+    """
+    Lee una tabla guardada en disco. La de la temporada en curso solo se usa si no ha caducado.
+
+    Args:
+        league (str): Liga de la tabla.
+        season (str): Temporada de la tabla.
+        stat (str): Tipo de estadística.
+
+    Returns:
+        pd.DataFrame: Tabla guardada, o None si no existe, ha caducado o no se puede leer.
+    """
+    path = ruta_cache(league, season, stat)
+    if not path.exists():
+        return None
+    if season == TEMPORADA_ACTUAL and time.time() - path.stat().st_mtime > CACHE_EDAD_MAXIMA_ACTUAL:
+        return None
+
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"Error al leer la caché {path}: {e}")
+        return None
+
+
+def guardar_cache_parquet(df, league, season, stat):
+    """
+    Guarda en disco (parquet comprimido con zstd) una tabla ya procesada.
+
+    Args:
+        df (pd.DataFrame): Tabla ya procesada por `extract_tables`.
+        league (str): Liga de la tabla.
+        season (str): Temporada de la tabla.
+        stat (str): Tipo de estadística.
+    """
+    path = ruta_cache(league, season, stat)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # Las columnas de texto mezclan cadenas y los 0 del fillna, y parquet necesita un único tipo por columna
+        columnas_texto = df.select_dtypes(include='object').columns
+        df.astype({col: str for col in columnas_texto}).to_parquet(path, compression='zstd')
+    except Exception as e:
+        print(f"Error al guardar la caché {path}: {e}")
+
+
+def fetch_html(url):
+    """
+    Descarga el HTML de una página de FBref.
+
+    Args:
+        url (str): URL de la página.
+
+    Returns:
+        str: Contenido HTML de la página.
+    """
+    response = SESSION.get(url, timeout=(5, 30))
+    response.raise_for_status()
+    return response.text
+
+
+def recortar_tabla(html, table_id):
+    """
+    Recorta del HTML únicamente la tabla con el id indicado (aunque esté dentro de un comentario),
+    para que el parser solo procese esa tabla y no la página completa.
+
+    Args:
+        html (str): HTML de la página de FBref.
+        table_id (str): Id de la tabla (ver `STAT_TABLE_IDS`).
+
+    Returns:
+        str: HTML de la tabla sin marcadores de comentario, o None si no se encuentra.
+    """
+    posicion_id = html.find(f'id="{table_id}"')
+    inicio = html.rfind('<table', 0, posicion_id) if posicion_id != -1 else -1
+    fin = html.find('</table>', posicion_id) if inicio != -1 else -1
+    if fin == -1:
+        return None
+    return PATRON_COMENTARIOS.sub('', html[inicio:fin + len('</table>')])
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def extraer_tabla_fbref(league, season, stat, url, save_excel=False):
     """
-    Extrae las tablas de estadísticas de FBRef.
+    Descarga (o lee del parquet en disco) y procesa la tabla de estadísticas de FBRef.
+    Si algo falla se lanza la excepción en lugar de devolver None: Streamlit no cachea las excepciones,
+    así que un error puntual (por ejemplo un 429 de FBref) se vuelve a intentar en la siguiente llamada.
 
     Args:
         league (str): Liga a extraer (ejemplo: 'Big 5 European Leagues').
         season (str): Temporada específica.
         stat (str): Tipo de estadística.
-        team_type (str): Tipo de datos ('players', 'teams', etc.).
+        url (str): URL de la tabla (ver `scrape_stats_player`).
         save_excel (bool): Si se debe guardar el DataFrame como un archivo Excel.
 
     Return:
-        tuple: DataFrame con los datos extraídos y la URL de origen.
+        pd.DataFrame: DataFrame con los datos extraídos.
     """
-    # Iniciar `df` y `url` por defecto como None
-    df = None
-    url = None
+    # Si la tabla está guardada en disco (y no ha caducado) se lee del parquet, sin descargar ni procesar el HTML
+    df = leer_cache_parquet(league, season, stat)
+    if df is not None:
+        return df
 
-    # Obtener la URL usando la función `scrape_stats_player`
+    # Descargar el HTML una sola vez con la sesión compartida
     try:
-        url = scrape_stats_player(league, season, stat)
-        if not url:
-            print("❌ No se pudo generar la URL.")
-            return df, url
-        print(f"URL generada: {url}")
+        html = fetch_html(url)
     except Exception as e:
-        print(f"Error al obtener la URL: {e}")
-        return df, url  # Aseguramos que se devuelvan None si hay error
+        print(f"Error al descargar la página de FBref: {e}")
+        raise  # No se cachea el error: se reintenta en la siguiente llamada
 
     # Intentar leer las tablas visibles con pandas.read_html
     try:
-        tables = pd.read_html(url)
-
-        if "Big5" in url and tables:
+        # Solo en las páginas "Big5" la tabla de jugadores es visible: en el resto de ligas no se parsea
+        # la página completa y se pasa directamente a la tabla comentada.
+        # Se parsea únicamente la tabla de la estadística (por su id) y no todas las de la página
+        if "Big5" in url:
+            tables = pd.read_html(StringIO(recortar_tabla(html, STAT_TABLE_IDS[stat]) or html), flavor='lxml')
+        else:
+            tables = []
+
+        if tables:
             print(f"Scraping datos de {stat} desde FBRef...")
             df = tables[0].fillna(0)
 
             # Reformatear columnas
             df = format_dataframe_columns(df, stat)
-            df = df[df.iloc[:, 0] != 'Rk'].reset_index(drop=True)
-            df = df.loc[:, ~df.columns.str.contains('matches', case=False)]
-            df = df.loc[:, ~df.columns.str.contains('Rk', case=False)]
+            # Quitar en una sola selección las filas de cabecera repetidas ('Rk') y las columnas 'matches' y 'Rk'
+            columnas = ~df.columns.str.contains(PATRON_COLUMNAS_DESCARTADAS)
+            df = df.loc[df.iloc[:, 0].ne('Rk'), columnas].reset_index(drop=True)
 
-            return df, url  # ⬅ Devuelve correctamente el DataFrame y la URL
+            guardar_cache_parquet(df, league, season, stat)
+            return df  # ⬅ Devuelve correctamente el DataFrame
 
     except Exception as e:
         print(f"Error con pandas.read_html: {e}")
-        return df, url  # En caso de error, retorna `df` como None
+        raise  # No se cachea el error: se reintenta en la siguiente llamada
 
-    # 🔹 Si `read_html` falla, intenta con BeautifulSoup
+    # 🔹 Si `read_html` no encuentra la tabla, FBref la tiene dentro de un comentario HTML:
+    # se recorta solo esa tabla (sin los marcadores de comentario) y se lee directamente por su id
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"})
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        comment_tables = soup.find_all(string=lambda t: isinstance(t, Comment))
-        comment_table = None
-        for c in comment_tables:
-            if '<div class="table_container"' in c:
-                comment_table = c
-                break
-
-        if not comment_table:
-            raise ValueError("No se encontró ninguna tabla en comentarios.")
-
-        # Parsear HTML dentro del comentario
-        comment_html = BeautifulSoup(comment_table, 'html.parser')
-        table = comment_html.find('table')
-        if not table:
-            raise ValueError("No se encontró una tabla en el HTML.")
-
-        # Extraer datos
-        headings = [th.get_text() for th in table.find_all("th", scope="col")]
-        data = []
-        for row in table.find('tbody').find_all('tr'):
-            cols = [td.get_text(strip=True) for td in row.find_all(['th', 'td'])]
-            data.append(cols)
-
-        df = pd.DataFrame(data, columns=headings).fillna(0).reset_index(drop=True)
+        table_id = STAT_TABLE_IDS[stat]
+        tabla = recortar_tabla(html, table_id) or PATRON_COMENTARIOS.sub('', html)
+        df = pd.read_html(StringIO(tabla), attrs={'id': table_id}, flavor='lxml')[0]
+        df = df.fillna(0).reset_index(drop=True)
+
+        # Reformatear columnas
+        df = format_dataframe_columns(df, stat)
 
         # Agregar la columna 'Comp' si no es "Big 5 European Leagues"
         if league != 'Big 5 European Leagues':
-            df.insert(4, 'Comp', [league] * len(df))
+            df.insert(4, f'Comp ({stat})', [league] * len(df))
 
-        # Reformatear columnas
-        df = format_dataframe_columns(df, stat)
-        df = df[df.iloc[:, 0] != 'Rk'].reset_index(drop=True)
-        df = df.loc[:, ~df.columns.str.contains('matches', case=False)]
-        df = df.loc[:, ~df.columns.str.contains('Rk', case=False)]
+        # Quitar en una sola selección las filas de cabecera repetidas ('Rk') y las columnas 'matches' y 'Rk'
+        columnas = ~df.columns.str.contains(PATRON_COLUMNAS_DESCARTADAS)
+        df = df.loc[df.iloc[:, 0].ne('Rk'), columnas].reset_index(drop=True)
 
         if save_excel:
             df.to_excel(f'{league} - {season} - {stat} - player stats.xlsx')
 
-        return df, url  # ⬅ Devuelve correctamente el DataFrame y la URL
+        guardar_cache_parquet(df, league, season, stat)
+        return df  # ⬅ Devuelve correctamente el DataFrame
+
+    except Exception as e:
+        print(f"Error al leer la tabla comentada: {e}")
+        raise  # No se cachea el error: se reintenta en la siguiente llamada
+
+
+def extract_tables(league='La Liga', season='2024-2025', stat='Goalkeeping', save_excel=False):
+    """
+    Extrae las tablas de estadísticas de FBRef. La descarga y el procesado están cacheados en
+    `extraer_tabla_fbref`; esta función no se cachea para que los errores no queden guardados
+    y la siguiente llamada vuelva a intentarlo.
+
+    Args:
+        league (str): Liga a extraer (ejemplo: 'Big 5 European Leagues').
+        season (str): Temporada específica.
+        stat (str): Tipo de estadística.
+        save_excel (bool): Si se debe guardar el DataFrame como un archivo Excel.
 
+    Return:
+        tuple: DataFrame con los datos extraídos (None si hubo error) y la URL de origen.
+    """
+    # Obtener la URL usando la función `scrape_stats_player`
+    try:
+        url = scrape_stats_player(league, season, stat)
+        if not url:
+            print("❌ No se pudo generar la URL.")
+            return None, url
+        print(f"URL generada: {url}")
     except Exception as e:
-        print(f"Error con BeautifulSoup: {e}")
-        return df, url  # Devuelve `df` como None si hubo error, pero mantiene la URL
+        print(f"Error al obtener la URL: {e}")
+        return None, None  # Aseguramos que se devuelvan None si hay error
+
+    try:
+        return extraer_tabla_fbref(league, season, stat, url, save_excel), url
+    except Exception:
+        return None, url  # Devuelve `df` como None si hubo error (ya mostrado), pero mantiene la URL
+
+
+def extract_many(tasks, max_workers=4):
+    """
+    Ejecuta `extract_tables` en paralelo para varias tablas. Tanto la descarga (requests) como el
+    parseo con lxml liberan el GIL, por lo que un pool de hilos acotado solapa casi todo el trabajo.
+    Se limita a 4 peticiones simultáneas porque FBref bloquea temporalmente a quien hace demasiadas.
+
+    Args:
+        tasks (list): Tuplas (league, season, stat) a extraer.
+        max_workers (int): Número máximo de tablas procesadas a la vez.
+
+    Returns:
+        list: Tuplas (DataFrame, URL) devueltas por `extract_tables`, en el mismo orden que `tasks`.
+    """
+    # No se crean más hilos que tablas a extraer (por ejemplo, 2 para los porteros)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        return list(executor.map(lambda task: extract_tables(*task), tasks))
     
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 def obtener_foramtear_playingtime_jugadores(league='Big 5 European Leagues', season="2024-2025", stat="Playing Time"):
     """
     Obtiene y formatea la tabla de 'Playing Time' (tiempo de juego) de jugadores 
@@ -642,9 +924,102 @@ def obtener_foramtear_playingtime_jugadores(league='Big 5 European Leagues', sea
     return df_playingtime
 
 
-@st.cache_data
-def creacion_df_general_fbref(league='Big 5 European Leagues', season="2024-2025", stat=["Standard Stats","Shooting","Passing", "Pass Types", 
-                                                                       "Goal and Shot Creation", "Defensive Actions","Possession", "Miscellaneous Stats"]):
+# Columnas que identifican a un jugador en todas las tablas de FBref (un jugador traspasado aparece una vez por equipo).
+# La edad no forma parte de la clave: FBref la da en "años-días" según el día en que se generó la página, y las
+# tablas se descargan por separado, así que un cumpleaños entre dos descargas partiría al jugador en dos filas
+CLAVES_JUGADOR = ['Player', 'Equipo', 'Competicion']
+
+
+def combinar_tablas(tablas, claves=CLAVES_JUGADOR):
+    """
+    Combina en un único DataFrame las tablas ya formateadas de un mismo grupo de jugadores.
+    Las tablas se unen por jugador (`claves`) y no por posición de fila, porque no todas tienen
+    las mismas filas (la de tiempo de juego, por ejemplo, está filtrada). Las columnas repetidas
+    dentro de una tabla se quitan antes y las comunes a varias tablas se quedan con la de la primera.
+
+    Args:
+        tablas (list): DataFrames formateados con `formatear_datos`, en el orden en que se quieren sus columnas.
+        claves (list): Columnas que identifican a cada jugador.
+
+    Return:
+        pd.DataFrame: DataFrame combinado. Falla (MergeError) si un jugador aparece repetido en alguna tabla.
+    """
+    # Cada tabla aporta solo las columnas que aún no han aparecido (más las claves), de modo que
+    # las columnas repetidas no llegan a copiarse en los merges
+    vistas = set()
+    tablas_proyectadas = []
+    for df in tablas:
+        conservar = ~df.columns.duplicated(keep='first') & (~df.columns.isin(vistas) | df.columns.isin(claves))
+        vistas.update(df.columns)
+        tablas_proyectadas.append(df.loc[:, conservar])
+
+    return reduce(
+        lambda izquierda, derecha: izquierda.merge(derecha, on=claves, how='outer', validate='1:1'),
+        tablas_proyectadas
+    )
+
+
+def a_numerico_reducido(serie):
+    """
+    Convierte una columna a numérica (los valores no convertibles pasan a NaN) con el tipo más
+    pequeño que representa sus valores: entero si todos son enteros y float32 en otro caso.
+
+    Args:
+        serie (pd.Series): Columna a convertir.
+
+    Returns:
+        pd.Series: Columna numérica.
+    """
+    numerica = pd.to_numeric(serie, errors='coerce', downcast='integer')
+    if pd.api.types.is_float_dtype(numerica):
+        numerica = pd.to_numeric(numerica, downcast='float')
+    return numerica
+
+
+def reducir_float64(df):
+    """
+    Pasa a float32 las columnas float64 que queden en el DataFrame (por ejemplo, columnas que ya eran
+    numéricas y no han pasado por `a_numerico_reducido`), para que todo el DataFrame use la mitad de memoria.
+
+    Args:
+        df (pd.DataFrame): DataFrame a reducir.
+
+    Returns:
+        pd.DataFrame: DataFrame sin columnas float64.
+    """
+    cols_float64 = df.select_dtypes('float64').columns
+    if len(cols_float64):
+        df[cols_float64] = df[cols_float64].astype('float32')
+    return df
+
+
+def convertir_bloque_numerico(df, columnas):
+    """
+    Convierte a numéricas las columnas indicadas con el tipo más pequeño posible (ver `a_numerico_reducido`).
+    Primero se intenta convertir todo el bloque de una vez a float64; solo si alguna columna tiene
+    valores no numéricos se convierte columna a columna con `pd.to_numeric`.
+
+    Args:
+        df (pd.DataFrame): DataFrame al que aplicar la conversión.
+        columnas (list): Columnas a convertir.
+
+    Returns:
+        pd.DataFrame: DataFrame con columnas convertidas.
+    """
+    try:
+        bloque = pd.DataFrame(df[columnas].to_numpy(dtype='float64'), columns=columnas, index=df.index)
+    except (ValueError, TypeError):
+        bloque = df[columnas]
+
+    # El DataFrame se construye de una vez: asignar las columnas convertidas sobre `df` las reemplaza
+    # una a una y lo fragmenta en un bloque interno por columna (PerformanceWarning en los pasos siguientes)
+    convertidas = bloque.apply(a_numerico_reducido)
+    return pd.concat([df.drop(columns=columnas), convertidas], axis=1)[df.columns]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def creacion_df_general_fbref(league='Big 5 European Leagues', season="2024-2025", stat=("Standard Stats","Shooting","Passing", "Pass Types", 
+                                                                       "Goal and Shot Creation", "Defensive Actions","Possession", "Miscellaneous Stats")):
     """
     Crea un DataFrame general combinando múltiples estadísticas avanzadas de jugadores desde FBref.
 
@@ -657,62 +1032,25 @@ def creacion_df_general_fbref(league='Big 5 European Leagues', season="2024-2025
     Args:
         league (str): Liga de la que se extraerán los datos.
         season (str): Temporada de la que se extraerán los datos.
-        stat (list): Lista de tipos de estadísticas a extraer.
+        stat (tuple): Tipos de estadísticas a extraer.
     Return:
         pd.DataFrame: DataFrame combinado con estadísticas de jugadores de la liga especificada.
     
     """
-    
-    df_stats, url = extract_tables(league=league, season="2024-2025", stat="Standard Stats")
-    print(df_stats)
-    print(df_stats.columns)
-    df_general_stats= formatear_datos(df_stats)
-    
-    df_shooting, url = extract_tables(league=league, season="2024-2025", stat="Shooting")
-    df_general_shooting = formatear_datos(df_shooting)
-    
-    df_passing, url = extract_tables(league=league, season="2024-2025", stat="Passing")
-    df_general_passing = formatear_datos(df_passing)
-
-    df_passingtype, url = extract_tables(league=league, season="2024-2025", stat="Pass Types")
-    df_general_passingtype = formatear_datos(df_passingtype)
-
-    df_gca, url = extract_tables(league=league, season="2024-2025", stat="Goal and Shot Creation")
-    df_general_gca = formatear_datos(df_gca)
-
-    df_defensiveactions, url = extract_tables(league=league, season="2024-2025", stat="Defensive Actions")
-    df_general_df_defensiveactions = formatear_datos(df_defensiveactions)
-
-    df_possession, url = extract_tables(league=league, season="2024-2025", stat="Possession")
-    df_general_possession = formatear_datos(df_possession)
-    
-    df_misc, url = extract_tables(league=league, season="2024-2025", stat="Miscellaneous Stats")
-    df_general_misc = formatear_datos(df_misc)
+    # Descargar y parsear en paralelo las tablas de todas las estadísticas y formatearlas:
+    # se acumulan en una lista y se combinan una sola vez al final
+    tablas = [formatear_datos(df) for df, url in extract_many([(league, "2024-2025", s) for s in stat])]
 
     df_playingtime= obtener_foramtear_playingtime_jugadores(league='Big 5 European Leagues', season="2024-2025", stat="Playing Time")
-    df_playingtime_jugadores= formatear_datos(df_playingtime)
-    
+    tablas.append(formatear_datos(df_playingtime))
 
-    df_general_final= pd.concat([df_general_stats, df_general_shooting, df_general_passing,df_general_passingtype,
-                             df_general_gca, df_general_df_defensiveactions, df_general_possession, df_general_misc, df_playingtime_jugadores], axis=1)
-    df_general_final = df_general_final.loc[:, ~df_general_final.columns.duplicated(keep='first')]
-    df_general_final.loc[:, df_general_final.columns[7:]] = df_general_final.loc[:, df_general_final.columns[7:]].apply(pd.to_numeric, errors='coerce')
+    df_general_final = combinar_tablas(tablas)
+    df_general_final = convertir_bloque_numerico(df_general_final, df_general_final.columns[7:])
     return df_general_final
 
-#SE EJECUTA LA FUNCIÓN PARA CREAR EL DF GENERAL
-df_general_final= creacion_df_general_fbref(league='Big 5 European Leagues', season="2024-2025",
-                                             stat=["Standard Stats","Shooting","Passing", "Pass Types", 
-                                                        "Goal and Shot Creation", "Defensive Actions","Possession", "Miscellaneous Stats"]) 
-
-# Procesar las posiciones de los jugadores
-df_general_final = procesar_posiciones(df_general_final, columna='Posicion')
-
-# Filtrar jugadores de La Liga: ES EL QUE SE VA USAR PARA EL ANALISIS DE JUGADORES DE CAMPO
-df_jugadores_total_liga= df_general_final[df_general_final['Competicion']=='La Liga'].reset_index(drop=True)
-
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 #Obteniendo los porteros de La Liga
-def creacion_df_porteros_fbref(league='Big 5 European Leagues', season="2024-2025", stat=["Goalkeeping", 'Advanced Goalkeeping']):
+def creacion_df_porteros_fbref(league='Big 5 European Leagues', season="2024-2025", stat=("Goalkeeping", 'Advanced Goalkeeping')):
     """ 
     Crea un DataFrame de porteros combinando estadísticas de Goalkeeping y Advanced Goalkeeping desde FBref.
     Esta función:
@@ -723,29 +1061,93 @@ def creacion_df_porteros_fbref(league='Big 5 European Leagues', season="2024-202
     Args:
         league (str): Liga de la que se extraerán los datos.
         season (str): Temporada de la que se extraerán los datos.
-        stat (list): Lista de tipos de estadísticas a extraer, en este caso "Goalkeeping" y "Advanced Goalkeeping".
+        stat (tuple): Tipos de estadísticas a extraer, en este caso "Goalkeeping" y "Advanced Goalkeeping".
 
     Return:
         pd.DataFrame: DataFrame combinado con estadísticas de porteros de la liga especificada.
     """
-    df_goalkeepers, url = extract_tables(league=league, season="2024-2025", stat="Goalkeeping")
-    df_goalkeepers= formatear_datos(df_goalkeepers)
-    
-    df_advgoalkeepers, url = extract_tables(league=league, season="2024-2025", stat="Advanced Goalkeeping")
-    df_advgoalkeepers = formatear_datos(df_advgoalkeepers)
-     
-
-    df_goalkeepers_final= pd.concat([df_goalkeepers,df_advgoalkeepers], axis=1)
-    df_goalkeepers_final = df_goalkeepers_final.loc[:, ~df_goalkeepers_final.columns.duplicated(keep='first')]
-    df_goalkeepers_final.loc[:, df_goalkeepers_final.columns[7:]] = df_goalkeepers_final.loc[:, df_goalkeepers_final.columns[7:]].apply(pd.to_numeric, errors='coerce')
+    # Descargar y parsear en paralelo las tablas de ambas estadísticas, formatearlas y combinarlas una sola vez
+    tablas = [formatear_datos(df) for df, url in extract_many([(league, "2024-2025", s) for s in stat])]
+    df_goalkeepers_final = combinar_tablas(tablas)
+    df_goalkeepers_final = convertir_bloque_numerico(df_goalkeepers_final, df_goalkeepers_final.columns[7:])
     return df_goalkeepers_final
 
-# SE EJECUTA LA FUNCIÓN PARA CREAR EL DF DE PORTEROS
-df_goalkeepers_final= creacion_df_porteros_fbref(league='Big 5 European Leagues', season="2024-2025",
-                                             stat=["Goalkeeping", 'Advanced Goalkeeping'])
 
-# Filtrar porteros de La Liga: ES EL QUE SE VA USAR PARA EL ANALISIS DE PORTEROS
-df_porteros_liga= df_goalkeepers_final[df_goalkeepers_final['Competicion']=='La Liga'].reset_index(drop=True)
+@st.cache_data(ttl=3600, show_spinner=False)
+def cargar_jugadores(league='Big 5 European Leagues', season="2024-2025"):
+    """
+    Crea el DataFrame general de FBref, procesa las posiciones y filtra los jugadores de La Liga.
+    Al estar cacheada con argumentos simples, en los reruns se devuelve directamente el resultado
+    sin volver a pasar (ni hashear) los DataFrames intermedios por las funciones cacheadas internas.
+
+    Args:
+        league (str): Liga de la que se extraerán los datos.
+        season (str): Temporada de la que se extraerán los datos.
+
+    Return:
+        pd.DataFrame: Jugadores de La Liga con las estadísticas ya numéricas, usado para el análisis de jugadores de campo.
+    """
+    df_general_final = creacion_df_general_fbref(league=league, season=season)
+
+    # Procesar las posiciones de los jugadores
+    df_general_final = procesar_posiciones(df_general_final, columna='Posicion')
+
+    # Filtrar jugadores de La Liga
+    df_jugadores_total_liga = df_general_final[df_general_final['Competicion']=='La Liga'].reset_index(drop=True)
+
+    # Se convierte el DataFrame de jugadores a formato numérico (una sola vez, no en cada rerun)
+    df_jugadores_total_liga = convertir_columnas_numericas_jugadores(df_jugadores_total_liga, columna_inicio='Competicion')
+    #Se convierte la columna de Nacimiento a string para evitar problemas de visualización; como hay pocos
+    #años de nacimiento distintos se guarda como categoría (un único string por año, no uno por jugador)
+    df_jugadores_total_liga['Nacimiento'] = df_jugadores_total_liga['Nacimiento'].astype(str).astype('category')
+    # Todas las estadísticas en float32 (una sola vez al cargar)
+    return reducir_float64(df_jugadores_total_liga)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cargar_porteros(league='Big 5 European Leagues', season="2024-2025"):
+    """
+    Crea el DataFrame de porteros de FBref y filtra los porteros de La Liga.
+
+    Args:
+        league (str): Liga de la que se extraerán los datos.
+        season (str): Temporada de la que se extraerán los datos.
+
+    Return:
+        pd.DataFrame: Porteros de La Liga con las estadísticas ya numéricas, usado para el análisis de porteros.
+    """
+    df_goalkeepers_final = creacion_df_porteros_fbref(league=league, season=season)
+
+    # Filtrar porteros de La Liga
+    df_porteros_liga = df_goalkeepers_final[df_goalkeepers_final['Competicion']=='La Liga'].reset_index(drop=True)
+
+    # Se convierte el DataFrame de porteros a formato numérico (una sola vez, no en cada rerun), con todas
+    # las estadísticas en float32
+    df_porteros_liga = convertir_columnas_numericas_goalkeepers(df_porteros_liga, 'Competicion')
+    return reducir_float64(df_porteros_liga)
+
+def convertir_texto_a_numerico(df, columnas):
+    """
+    Convierte a valores numéricos las columnas indicadas, reemplazando comas por puntos y eliminando
+    porcentajes. Las columnas que ya son numéricas se dejan tal cual y en el resto se usan los
+    métodos vectorizados de `.str` (sin expresiones regulares), con el mismo tipo reducido que el
+    resto del bloque numérico (ver `a_numerico_reducido`).
+
+    Args:
+        df (pd.DataFrame): DataFrame al que aplicar la conversión.
+        columnas (list): Columnas a convertir.
+
+    Returns:
+        pd.DataFrame: DataFrame con columnas convertidas.
+    """
+    cols_texto = [col for col in columnas if not pd.api.types.is_numeric_dtype(df[col])]
+    if cols_texto:
+        df[cols_texto] = df[cols_texto].apply(
+            lambda col: a_numerico_reducido(
+                col.astype(str).str.replace(',', '.', regex=False).str.replace('%', '', regex=False)
+            )
+        )
+    return df
 
 def convertir_columnas_numericas_goalkeepers(df, columna_inicio):
     """
@@ -759,11 +1161,8 @@ def convertir_columnas_numericas_goalkeepers(df, columna_inicio):
     Returns:
         pd.DataFrame: DataFrame con columnas convertidas.
     """
-    cols_convertir = [col for col in df.columns[df.columns.get_loc(columna_inicio) + 1:]]
-    df[cols_convertir] = df[cols_convertir].apply(
-        lambda col: pd.to_numeric(col.replace({',': '.', '%': ''}, regex=True), errors='coerce')
-    )
-    return df
+    cols_convertir = df.columns[df.columns.get_loc(columna_inicio) + 1:]
+    return convertir_texto_a_numerico(df, cols_convertir)
 
 def convertir_columnas_numericas_jugadores(df, columna_inicio):
     """
@@ -779,13 +1178,13 @@ def convertir_columnas_numericas_jugadores(df, columna_inicio):
     """
     # Lista de columnas a convertir, excluyendo las dos últimas
     cols_convertir = df.columns[df.columns.get_loc(columna_inicio) + 1 : -2]
-
-    df[cols_convertir] = df[cols_convertir].apply(
-        lambda col: pd.to_numeric(col.replace({',': '.', '%': ''}, regex=True), errors='coerce')
-    )
-    return df
+    return convertir_texto_a_numerico(df, cols_convertir)
 
 #FUNCIONES PARA EL ANALISIS DE PORTEROS
+# Columnas que necesita el análisis de porteros
+COLUMNAS_PORTEROS = ['Player', 'Alineaciones', 'Tiros puerta recibidos', '% Paradas']
+
+@st.cache_data(show_spinner=False)
 def preparar_datos_porteros(df_porteros_liga, percentil= 0.60):
             """
             Filtra el DataFrame de porteros según el percentil de alineaciones y devuelve las columnas necesarias.
@@ -797,18 +1196,20 @@ def preparar_datos_porteros(df_porteros_liga, percentil= 0.60):
             Devuelve:
             - df_mask: DataFrame filtrado con columnas relevantes para el análisis
             """
-            # Calcular valor del percentil
-            percentil_val = df_porteros_liga['Alineaciones'].quantile(percentil)
+            # Calcular valor del percentil directamente con NumPy (nanquantile ignora los NaN, igual que pandas)
+            alineaciones = df_porteros_liga['Alineaciones'].to_numpy(dtype=float)
+            percentil_val = np.nanquantile(alineaciones, percentil)
 
-            # Filtrar porteros con suficientes alineaciones
-            df_filtrado = df_porteros_liga[df_porteros_liga['Alineaciones'] >= percentil_val].copy()
-
-            # Selección de columnas relevantes
-            df_mask = df_filtrado[['Player', 'Alineaciones', 'Tiros puerta recibidos', '% Paradas']].copy()
+            # Filtrar porteros con suficientes alineaciones y seleccionar las columnas relevantes en un solo paso
+            df_mask = df_porteros_liga.loc[
+                alineaciones >= percentil_val,
+                COLUMNAS_PORTEROS
+            ]
 
             return df_mask, percentil_val
 
 
+@st.cache_data(show_spinner=False)
 def graficar_tiros_vs_paradas(df_mask, percentil = 0.60):
     """
     Genera un gráfico de dispersión entre tiros a puerta recibidos y % de paradas, con línea de tendencia.
@@ -820,28 +1221,60 @@ def graficar_tiros_vs_paradas(df_mask, percentil = 0.60):
     Devuelve:
     - fig: objeto de gráfico Plotly
     """
-    fig = px.scatter(
-        df_mask,
-        x='Tiros puerta recibidos',
-        y='% Paradas',
-        text='Player',
-        hover_data=['Alineaciones'],
+    # Plotly se importa solo al dibujar: no se paga su carga en las ejecuciones que no muestran gráficos.
+    # Se construye con graph_objects a partir de arrays de NumPy, sin la capa de plotly.express
+    import plotly.graph_objects as go
+
+    tiros = df_mask['Tiros puerta recibidos'].to_numpy(dtype=float)
+    paradas = df_mask['% Paradas'].to_numpy(dtype=float)
+
+    # Puntos dibujados con WebGL (Scattergl) en lugar de SVG
+    fig = go.Figure(go.Scattergl(
+        x=tiros,
+        y=paradas,
+        mode='markers+text',
+        text=df_mask['Player'].to_numpy(),
+        textposition='top center',
+        customdata=df_mask['Alineaciones'].to_numpy(),
+        hovertemplate='Tiros a Puerta Recibidos=%{x}<br>% de Paradas=%{y}<br>Player=%{text}'
+                      '<br>Alineaciones=%{customdata}<extra></extra>',
+        showlegend=False
+    ))
+
+    # 🔥 Línea de tendencia por regresión lineal (mínimos cuadrados) calculada con NumPy
+    validos = ~(np.isnan(tiros) | np.isnan(paradas))
+    if validos.sum() >= 2:
+        pendiente, ordenada = np.polyfit(tiros[validos], paradas[validos], 1)
+        x_tendencia = np.sort(tiros[validos])
+        fig.add_trace(go.Scattergl(
+            x=x_tendencia,
+            y=pendiente * x_tendencia + ordenada,
+            mode='lines',
+            line=dict(color='red'),
+            name='Tendencia (OLS)',
+            hovertemplate=f'% de Paradas = {pendiente:.4f} * Tiros + {ordenada:.4f}<extra></extra>',
+            showlegend=False
+        ))
+
+    fig.update_layout(
         title=f'Relación entre Tiros a Puerta Recibidos y % de Paradas.',
-        labels={
-            'Tiros puerta recibidos': 'Tiros a Puerta Recibidos',
-            '% Paradas': '% de Paradas'
-        },
+        title_font_size=18,
+        xaxis_title='Tiros a Puerta Recibidos',
+        yaxis_title='% de Paradas',
         template='plotly_white',
-        trendline='ols',  # 🔥 Aquí se activa la regresión lineal
-        trendline_color_override='red'
+        height=600
     )
 
-    fig.update_traces(textposition='top center')
-    fig.update_layout(title_font_size=18, height=600)
-
     return fig
 
 #FUNCIONES PARA EL ANALISIS DE DEFENSAS
+# Columnas que necesita el análisis de defensores
+COLUMNAS_DEFENSORES = [
+    'Player', 'Equipo', 'Edad', 'Minutos jugados/90',
+    'Derribos', 'Derribos (Def 3rd)', 'Derribos (Mid 3rd)', 'Derribos (Att 3rd)'
+]
+
+@st.cache_data(show_spinner=False)
 def preparar_df_defensores_sub25(df_def, percentil= 0.75):
     """
     Filtra y prepara el DataFrame con defensores Sub-25 que han jugado al menos el percentil 75 de minutos (26.0),
@@ -856,20 +1289,16 @@ def preparar_df_defensores_sub25(df_def, percentil= 0.75):
     -Percentil_minutos: valor del percentil 75
     """
     
-    # Calcular valor del percentil
-    percentil_minutos= df_def['Minutos jugados/90'].quantile(percentil)
-    # Filtro por edad y minutos jugados
-    df_filtrado = df_def[(df_def['Edad'] <= 25.0) & (df_def['Minutos jugados/90'] >= percentil_minutos)].copy()
-
-    # Selección de columnas y orden
-    columnas = [
-        'Player', 'Equipo', 'Edad', 'Minutos jugados/90',
-        'Derribos', 'Derribos (Def 3rd)', 'Derribos (Mid 3rd)', 'Derribos (Att 3rd)'
-    ]
-    df_filtrado = df_filtrado[columnas].sort_values(by='Derribos', ascending=False).reset_index(drop=True)
+    # Calcular valor del percentil directamente con NumPy (nanquantile ignora los NaN, igual que pandas)
+    minutos = df_def['Minutos jugados/90'].to_numpy(dtype=float)
+    percentil_minutos= np.nanquantile(minutos, percentil)
+    # Filtro por edad y minutos jugados, junto con la selección de columnas
+    filtro = (df_def['Edad'].to_numpy(dtype=float) <= 25.0) & (minutos >= percentil_minutos)
+    df_filtrado = df_def.loc[filtro, COLUMNAS_DEFENSORES].sort_values(by='Derribos', ascending=False).reset_index(drop=True)
 
     return df_filtrado, percentil_minutos
 
+@st.cache_data(show_spinner=False)
 def grafico_distribucion_derribos(df_defensores):
     """
     Visualiza la distribución de derribos por tercio del campo para defensores Sub-25.
@@ -881,25 +1310,22 @@ def grafico_distribucion_derribos(df_defensores):
     Retorna:
     - fig (plotly.graph_objects.Figure): gráfico de barras apiladas
     """
+    import plotly.graph_objects as go
 
     # Columnas a usar
     derribos_cols = ['Derribos (Def 3rd)', 'Derribos (Mid 3rd)', 'Derribos (Att 3rd)']
-    df_plot = df_defensores.copy()
+    # Copiar solo las columnas que se grafican, no el DataFrame completo
+    df_plot = df_defensores[['Player', *derribos_cols]].copy()
 
-    # Calcular porcentajes
-    df_plot[derribos_cols] =df_plot[derribos_cols].div(df_plot[derribos_cols].sum(axis=1), axis=0)
-    
-    # Convertir a formato largo
-    df_long = df_plot.melt(
-        id_vars='Player',
-        value_vars=derribos_cols,
-        var_name='Tercio del Campo',
-        value_name='Porcentaje'
-    )
+    # Calcular porcentajes: una única división de NumPy sobre el bloque, sin Series intermedias
+    # (los jugadores sin derribos quedan como NaN, igual que con DataFrame.div)
+    valores = df_plot[derribos_cols].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        valores /= np.nansum(valores, axis=1, keepdims=True)
+    df_plot[derribos_cols] = valores
 
-    # Ordenar jugadores por derribos en tercio defensivo
+    # Ordenar jugadores por derribos en tercio defensivo (el orden se aplica en el eje Y del gráfico)
     orden_jugadores = df_plot.sort_values(by='Derribos (Def 3rd)', ascending=True)['Player']
-    df_long['Player'] = pd.Categorical(df_long['Player'], categories=orden_jugadores, ordered=True)
 
     # Colores personalizados
     colores_tercios = {
@@ -908,20 +1334,27 @@ def grafico_distribucion_derribos(df_defensores):
         'Derribos (Att 3rd)': '#2ca02c'
     }
 
-    # Crear gráfico interactivo
-    fig = px.bar(
-        df_long,
-        x='Porcentaje',
-        y='Player',
-        color='Tercio del Campo',
-        color_discrete_map=colores_tercios,
-        orientation='h',
-        title='',
-        labels={'Porcentaje': 'Derribos (%)', 'Player': 'Jugador'}
-    )
+    # Crear gráfico interactivo: una traza de barras por tercio directamente desde las columnas
+    # del bloque de porcentajes, sin pasar a formato largo
+    jugadores = df_plot['Player'].to_numpy()
+    fig = go.Figure([
+        go.Bar(
+            x=valores[:, i],
+            y=jugadores,
+            name=col,
+            orientation='h',
+            marker_color=colores_tercios[col],
+            hovertemplate=f'Tercio del Campo={col}<br>Derribos (%)=%{{x}}<br>Jugador=%{{y}}<extra></extra>'
+        )
+        for i, col in enumerate(derribos_cols)
+    ])
 
     fig.update_layout(
     barmode='stack',
+    title='',
+    legend_title_text='Tercio del Campo',
+    xaxis_title='Derribos (%)',
+    yaxis_title='Jugador',
     yaxis={'categoryorder': 'array', 'categoryarray': list(orden_jugadores)},
     xaxis_tickformat='%',
     height=30 * len(orden_jugadores)  # Ajusta 30px por jugador; puedes cambiar este valor
@@ -930,6 +1363,10 @@ def grafico_distribucion_derribos(df_defensores):
     return fig,df_plot
 
 #FUNCIONES PARA EL ANALISIS DE CENTROCAMPISTAS
+# Columnas que necesita el análisis de centrocampistas
+COLUMNAS_CENTROCAMPISTAS = ['Player', 'Minutos jugados/90', "Pases progresivos", "Acciones creadores de goles/90", 'Pases clave']
+
+@st.cache_data(show_spinner=False)
 def filtros_centrocampistas(df, percentil= 0.85):
     """
     Filtra el DataFrame de centrocampistas según los criterios especificados:
@@ -942,40 +1379,60 @@ def filtros_centrocampistas(df, percentil= 0.85):
     Returns:
         pd.DataFrame: DataFrame filtrado de centrocampistas.
     """
-    percentil_ccampista_85= round(df['Minutos jugados/90'].quantile(percentil),2)
-    df_filtro= df[df['Minutos jugados/90'] >= percentil_ccampista_85].reset_index(drop=True)
-    df_mask_centrocampistas= df_filtro[['Player', 'Minutos jugados/90', "Pases progresivos", "Acciones creadores de goles/90", 'Pases clave']]
+    minutos = df['Minutos jugados/90'].to_numpy(dtype=float)
+    # Se filtra con el percentil sin redondear: con las columnas en float32, comparar con el valor
+    # redondeado dejaría fuera al jugador cuyo valor coincide con el percentil (26.9 -> 26.8999996 < 26.9)
+    percentil_minutos = np.nanquantile(minutos, percentil)
+    percentil_ccampista_85= round(percentil_minutos,2)  # Solo para mostrarlo en la interfaz
+    df_mask_centrocampistas= df.loc[
+        minutos >= percentil_minutos,
+        COLUMNAS_CENTROCAMPISTAS
+    ].reset_index(drop=True)
     
     return df_mask_centrocampistas, percentil_ccampista_85
 
 
 
+@st.cache_data(show_spinner=False)
 def visualizar_creadores_ofensivos_centrocampistas(df):
     """
     Visualiza la relación entre pases progresivos y acciones creadoras de goles por 90 (GCA/90),
     usando pases clave como tamaño y color del punto. Incluye líneas de media con los valores numéricos.
     """
+    import plotly.graph_objects as go
 
     # Calcular medias
     x_mean = df["Pases progresivos"].mean()
     y_mean = df["Acciones creadores de goles/90"].mean()
 
-    # Crear scatter plot
-    fig = px.scatter(
-        df,
-        x="Pases progresivos",
-        y="Acciones creadores de goles/90",
-        color="Pases clave",
-        size="Pases clave",
-        hover_name="Player",
+    pases_clave = df["Pases clave"].to_numpy(dtype=float)
+
+    # Crear scatter plot con WebGL (Scattergl) en lugar de SVG. El tamaño del punto es proporcional
+    # al área, con el mismo escalado que usa plotly.express (diámetro máximo de 20px)
+    fig = go.Figure(go.Scattergl(
+        x=df["Pases progresivos"].to_numpy(dtype=float),
+        y=df["Acciones creadores de goles/90"].to_numpy(dtype=float),
+        mode="markers",
+        hovertext=df["Player"].to_numpy(),
+        hovertemplate="<b>%{hovertext}</b><br><br>Pases progresivos=%{x}<br>GCA/90=%{y}"
+                      "<br>Pases clave=%{marker.color}<extra></extra>",
+        marker=dict(
+            color=pases_clave,
+            size=pases_clave,
+            sizemode="area",
+            sizeref=np.nanmax(pases_clave) / 20 ** 2 if len(pases_clave) else 1,
+            colorscale="Viridis",
+            showscale=True,
+            colorbar=dict(title="Pases clave")
+        ),
+        showlegend=False
+    ))
+
+    fig.update_layout(
         title="",
-        labels={
-            "Pases progresivos": "Pases progresivos",
-            "Acciones creadores de goles/90": "GCA/90",
-            "Pases clave": "Pases clave"
-        },
-        template="plotly_white",
-        color_continuous_scale="Viridis"
+        xaxis_title="Pases progresivos",
+        yaxis_title="GCA/90",
+        template="plotly_white"
     )
 
     # Añadir líneas de media
@@ -1014,6 +1471,10 @@ def visualizar_creadores_ofensivos_centrocampistas(df):
 
 
 #FUNCIONES PARA EL ANALISIS DE DELTANTEROS
+# Columnas que necesita el análisis de delanteros
+COLUMNAS_DELANTEROS = ['Player', 'Minutos jugados/90', 'Goles sin penaltis', 'xG sin penaltis']
+
+@st.cache_data(show_spinner=False)
 def calcular_diferencia_goles_xg(df, percentil=0.85):
     """
     Filtra jugadores por encima del percentil en Minutos jugados/90,
@@ -1026,49 +1487,51 @@ def calcular_diferencia_goles_xg(df, percentil=0.85):
     Retorna:
     - DataFrame ordenado por 'Diferencia_Goles_xG' con 1 decimal en las métricas
     """
-    percentil_valor = df['Minutos jugados/90'].quantile(percentil)
-    
-    df_filtrado = df[df['Minutos jugados/90'] >= percentil_valor].reset_index(drop=True).copy()
+    minutos = df['Minutos jugados/90'].to_numpy(dtype=float)
+    percentil_valor = np.nanquantile(minutos, percentil)
     
-    df_mask = df_filtrado[['Player', 'Minutos jugados/90', 'Goles sin penaltis', 'xG sin penaltis']].copy()
+    df_mask = df.loc[
+        minutos >= percentil_valor,
+        COLUMNAS_DELANTEROS
+    ].reset_index(drop=True)
     df_mask['Diferencia_Goles_xG'] = df_mask['Goles sin penaltis'] - df_mask['xG sin penaltis']
     
     df_ordenado = df_mask.sort_values('Diferencia_Goles_xG', ascending=True).reset_index(drop=True)
 
-    # Redondear a 1 decimal todas las columnas numéricas
+    # Redondear a 1 decimal todas las columnas numéricas (en float64: en float32 las etiquetas
+    # del gráfico mostrarían valores como 0.30000001)
     cols_numericas = df_ordenado.select_dtypes(include='number').columns
-    df_ordenado[cols_numericas] = df_ordenado[cols_numericas].round(1)
+    df_ordenado[cols_numericas] = df_ordenado[cols_numericas].astype('float64').round(1)
     
     return df_ordenado, percentil_valor
 
 
+@st.cache_data(show_spinner=False)
 def generar_grafico_diferencia_plotly(df_ordenado):
-    df_ordenado = df_ordenado.copy()
-    df_ordenado['Color'] = df_ordenado['Diferencia_Goles_xG'].apply(lambda x: 'green' if x > 0 else 'red')
-    df_ordenado['Etiqueta'] = df_ordenado['Diferencia_Goles_xG'].round(2)
-
-    fig = px.bar(
-        df_ordenado,
-        x='Diferencia_Goles_xG',
-        y='Player',
-        orientation='h',
-        color='Color',
-        color_discrete_map={'green': ' green', 'red': ' red'},
-        text='Etiqueta',
-        labels={ 'Player': 'Jugador', 'Diferencia_Goles_xG': 'Diferencia Goles - xG'},
-    )
+    import plotly.graph_objects as go
+
+    diferencia = df_ordenado['Diferencia_Goles_xG'].to_numpy(dtype=float)
 
-    fig.update_traces(
+    # Color de cada barra calculado de forma vectorizada (verde si supera su xG, rojo si no)
+    fig = go.Figure(go.Bar(
+        x=diferencia,
+        y=df_ordenado['Player'].to_numpy(),
+        orientation='h',
+        marker_color=np.where(diferencia > 0, 'green', 'red'),
+        marker_line_width=0.5,
+        text=np.round(diferencia, 2),
         textposition='outside',
         insidetextanchor='start',
-        marker_line_width=0.5,
-        textfont_size=11
-    )
+        textfont_size=11,
+        hovertemplate='Jugador=%{y}<br>Diferencia Goles - xG=%{x}<extra></extra>'
+    ))
 
     fig.add_vline(x=0, line_dash="dash", line_color="black", line_width=1)
 
     fig.update_layout(
         showlegend=False,
+        xaxis_title='Diferencia Goles - xG',
+        yaxis_title='Jugador',
         margin=dict(l=10, r=10, t=40, b=10),
         height=600,
         title_text='',
@@ -1077,6 +1540,11 @@ def generar_grafico_diferencia_plotly(df_ordenado):
 
     return fig
 
+# Botón para vaciar la caché (en disco y en memoria) y forzar una nueva descarga de FBref
+if st.sidebar.button("🗑️ Borrar caché"):
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    st.cache_data.clear()
+
 # Crear pestañas para organizar la presentación del proyecto
 tabs = st.tabs(["📌 Introducción", "🧪 Metodología", "🔍 Espacio de Hipótesis Analizadas", "📈 Análisis y Visualización", "🧠 Interpretación y Conclusiones"])
 
@@ -1106,7 +1574,9 @@ with tabs[0]:
     - 📦 **Entorno virtual**
     - 📊 **Pandas**
     - 🔢 **NumPy**             
-    - 🧼 **BeautifulSoup**
+    - 🧼 **lxml** (`pd.read_html`)
+    - 📈 **Plotly**
+    - 🏹 **PyArrow**
     - 🖥️ **Streamlit**          
 
     """)
@@ -1175,10 +1645,9 @@ with tabs[2]:
     Cada hipótesis ha sido diseñada para resolver una incertidumbre mediante datos cuantitativos, ya sean métricas tradicionales o más contextuales.
 
     ---
-    """)
 
-    # 🧤 PORTEROS
-    st.markdown("### 🧤 Porteros")
+    ### 🧤 Porteros
+    """)  # Introducción y cabecera de porteros en un único st.markdown
     with st.expander("📌 Hipótesis 1: No existe una relación significativa entre la cantidad de tiros a puerta recibidos y el porcentaje de paradas realizadas por los porteros."):
         st.markdown("""
         **Descripción:**  
@@ -1252,10 +1721,11 @@ with tabs[2]:
 
 # Contenido de la pestaña de análisis y visualización
 with tabs[3]:
-    # Se convierte el DataFrame de porteros a formato numérico
-    df_jugadores_total_liga= convertir_columnas_numericas_jugadores(df_jugadores_total_liga, columna_inicio='Competicion')
-    #Se convierte la columna de Nacimiento a string para evitar problemas de visualización
-    df_jugadores_total_liga['Nacimiento'] = df_jugadores_total_liga['Nacimiento'].astype(str)
+    # Los datos de FBref solo se cargan en la pestaña que los usa (cacheados tras la primera vez)
+    df_jugadores_total_liga = cargar_jugadores()
+    df_porteros_liga = cargar_porteros()
+    # Jugadores de campo separados por posición principal (calculado una sola vez y cacheado)
+    jugadores_por_posicion = separar_por_posicion(df_jugadores_total_liga)
 
     # Mostrar análisis para defensores
     def mostrar_analisis_defensores(df):
@@ -1263,7 +1733,7 @@ with tabs[3]:
             st.subheader("🛡️ Análisis para Defensores")
             
             # Preparar el DataFrame de defensores Sub-25
-            df_filtro_def, percentil_minutos= preparar_df_defensores_sub25(df, percentil= 0.75)
+            df_filtro_def, percentil_minutos= preparar_df_defensores_sub25(df[COLUMNAS_DEFENSORES], percentil= 0.75)
             # Calcular el valor del percentil para mostrarlo en la interfaz
             valor_percentil_def= round(percentil_minutos,2)
         
@@ -1304,7 +1774,7 @@ with tabs[3]:
     # Mostrar análisis para centrocampistas
     def mostrar_analisis_centrocampistas(df):
             st.subheader("🧠 Análisis para Centrocampistas")          
-            df_mask_centrocampitas, valor_percentil_centrocampistas= filtros_centrocampistas(df, percentil= 0.85)
+            df_mask_centrocampitas, valor_percentil_centrocampistas= filtros_centrocampistas(df[COLUMNAS_CENTROCAMPISTAS], percentil= 0.85)
 
             st.markdown("""
             **Recordatorio de la hipótesis:**
@@ -1356,9 +1826,8 @@ with tabs[3]:
     def mostrar_analisis_delanteros(df):
             st.subheader("🎯 Análisis para Delanteros")
             
-            df_ordenado, percentil_valor= calcular_diferencia_goles_xg(df, percentil=0.85)
+            df_ordenado, percentil_valor= calcular_diferencia_goles_xg(df[COLUMNAS_DELANTEROS], percentil=0.85)
             
-            df_ordenado[df_ordenado.select_dtypes(include='number').columns] = df_ordenado.select_dtypes(include='number').round(1)
             valor_percentil= round(percentil_valor,2)
             
             st.markdown("""
@@ -1395,87 +1864,72 @@ with tabs[3]:
             """)  
             
 
-    # Diccionario de traducción de posiciones
-    traduccion_posiciones = {
-        'Midfielder': 'Centrocampista',
-        'Defender': 'Defensa',
-        'Forward': 'Delantero',
-        'Goalkeeper': 'Portero',
-        # añade más si tu DataFrame incluye otros
-    }
-
-    # Lista original de posiciones (en inglés)
-    posiciones_originales = df_jugadores_total_liga['Posicion_principal'].unique().tolist()
-
-    # Traducción visible al usuario
-    posiciones_traducidas = [traduccion_posiciones.get(pos, pos) for pos in posiciones_originales]
-
-    # Mostrar selectbox con posiciones en castellano
-    posicion_traducida = st.selectbox("Selecciona una posición para visualizar el análisis:", posiciones_traducidas)
-
-    # Obtener la posición original (en inglés) seleccionada por el usuario
-    # Esto es clave para usarla luego en filtros del DataFrame
-    posicion_seleccionada = [k for k, v in traduccion_posiciones.items() if v == posicion_traducida][0]
+    # Mostrar análisis para porteros
+    def mostrar_analisis_porteros(df):
+            st.subheader("🧤 Análisis para Porteros")
 
-    # Mostrar contenido según la posición seleccionada
-    if posicion_seleccionada == "Goalkeeper":
-        st.subheader("🧤 Análisis para Porteros")
+            df_filtro_porteros, percentil_val= preparar_datos_porteros(df[COLUMNAS_PORTEROS], percentil= 0.60)
+            valor_percentil_porteros= round(percentil_val,2)
 
-        df_porteros_final = convertir_columnas_numericas_goalkeepers(df_porteros_liga, 'Competicion')
-        
-        df_filtro_porteros, percentil_val= preparar_datos_porteros(df_porteros_liga, percentil= 0.60)
-        valor_percentil_porteros= round(percentil_val,2)
-
-        st.markdown("""
-            **Recordatorio de la hipótesis:**
+            st.markdown("""
+                **Recordatorio de la hipótesis:**
                 
-                "No existe una relación significativa entre la cantidad de tiros a puerta recibidos y el porcentaje de paradas realizadas por los porteros."
-            """)
+                    "No existe una relación significativa entre la cantidad de tiros a puerta recibidos y el porcentaje de paradas realizadas por los porteros."
+                """)
         
-        st.info(f'Se ha hecho un filtro previo de esos jugadores que estan por encima del cuartil 60 (**{valor_percentil_porteros:.1f}**) en ser alineados.')
+            st.info(f'Se ha hecho un filtro previo de esos jugadores que estan por encima del cuartil 60 (**{valor_percentil_porteros:.1f}**) en ser alineados.')
         
         
-        fig_porteros= graficar_tiros_vs_paradas(df_filtro_porteros, percentil= valor_percentil_porteros)
-        st.plotly_chart(fig_porteros, use_container_width=True)  
+            fig_porteros= graficar_tiros_vs_paradas(df_filtro_porteros, percentil= valor_percentil_porteros)
+            st.plotly_chart(fig_porteros, use_container_width=True)  
 
-        st.markdown("""
-            🔎 **Análisis de resultados visuales**
+            st.markdown("""
+                🔎 **Análisis de resultados visuales**
 
-                Relación entre Tiros a Puerta Recibidos y % de Paradas:
+                    Relación entre Tiros a Puerta Recibidos y % de Paradas:
 
-                - La línea de tendencia negativa sugiere que, en general, a mayor cantidad de tiros a puerta recibidos, menor es el % de paradas. Esto respalda parcialmente la hipótesis de que los porteros más exigidos pueden tener dificultades para mantener altos niveles de eficiencia.
+                    - La línea de tendencia negativa sugiere que, en general, a mayor cantidad de tiros a puerta recibidos, menor es el % de paradas. Esto respalda parcialmente la hipótesis de que los porteros más exigidos pueden tener dificultades para mantener altos niveles de eficiencia.
 
-                - No obstante, hay **excepciones notables** que desafían esta tendencia:
+                    - No obstante, hay **excepciones notables** que desafían esta tendencia:
 
-                    📈 Porteros con alto % de paradas pese a volumen elevado:
-                    - Unai Simón (79%): Destaca con el mayor % de paradas, aunque no es de los más exigidos en volumen.
-                    - Sergio Herrera (75.3%) y Joan García (75.5%): Con más de 180 y 190 tiros recibidos respectivamente, logran un gran rendimiento.
-                    - David Soria y Augusto Batalla (~75.2%): También sobresalen entre los más exigidos.
+                        📈 Porteros con alto % de paradas pese a volumen elevado:
+                        - Unai Simón (79%): Destaca con el mayor % de paradas, aunque no es de los más exigidos en volumen.
+                        - Sergio Herrera (75.3%) y Joan García (75.5%): Con más de 180 y 190 tiros recibidos respectivamente, logran un gran rendimiento.
+                        - David Soria y Augusto Batalla (~75.2%): También sobresalen entre los más exigidos.
 
                             
-                    📉 Porteros con bajo % de paradas pese a menos tiros:
-                    - Karl Jakob Hein (60.7%) y Vicente Guaita (64.6%): Reciben un volumen alto pero muestran poca eficacia.
-                    - Diego Conde (68.1%) y Nyland (67.9%): Niveles de parada por debajo del promedio, con volumen moderado.
+                        📉 Porteros con bajo % de paradas pese a menos tiros:
+                        - Karl Jakob Hein (60.7%) y Vicente Guaita (64.6%): Reciben un volumen alto pero muestran poca eficacia.
+                        - Diego Conde (68.1%) y Nyland (67.9%): Niveles de parada por debajo del promedio, con volumen moderado.
 
-            """) 
-    # Mostrar análisis según la posición seleccionada
-    elif posicion_seleccionada == "Defender":
-        # Filtro para defensores respectando la posición principal elegida
-        df_def = df_jugadores_total_liga[df_jugadores_total_liga['Posicion_principal'] == 'Defender'].copy()
-        # Aplicar limpieza a la columna 'Posicion_2' para evitar valores nulos o vacíos
-        df_def['Posicion_2'] = df_def['Posicion_2'].fillna('').apply(lambda x: x if x.strip() else 'No encontrado')
-        # Mostrar análisis para defensores
-        mostrar_analisis_defensores(df_def.reset_index(drop=True))
-
-    elif posicion_seleccionada == "Midfielder":
-        df_mid = df_jugadores_total_liga[df_jugadores_total_liga['Posicion_principal'] == 'Midfielder'].copy()
-        df_mid['Posicion_2'] = df_mid['Posicion_2'].fillna('').apply(lambda x: x if x.strip() else 'No encontrado')
-        mostrar_analisis_centrocampistas(df_mid.reset_index(drop=True))
-
-    elif posicion_seleccionada == "Forward":
-        df_fw = df_jugadores_total_liga[df_jugadores_total_liga['Posicion_principal'] == 'Forward'].copy()
-        df_fw['Posicion_2'] = df_fw['Posicion_2'].fillna('').apply(lambda x: x if x.strip() else 'No encontrado')
-        mostrar_analisis_delanteros(df_fw.reset_index(drop=True))
+                """) 
+
+
+    # Lista original de posiciones (en inglés)
+    # 'Posicion_principal' es categórica (ver `procesar_posiciones`): sus categorías ya son las posiciones distintas
+    posiciones_originales = df_jugadores_total_liga['Posicion_principal'].cat.categories.tolist()
+
+    # Traducción visible al usuario
+    posiciones_traducidas = [TRADUCCION_POSICIONES.get(pos, pos) for pos in posiciones_originales]
+
+    # Mostrar selectbox con posiciones en castellano
+    posicion_traducida = st.selectbox("Selecciona una posición para visualizar el análisis:", posiciones_traducidas)
+
+    # Obtener la posición original (en inglés) seleccionada por el usuario
+    # Esto es clave para usarla luego en filtros del DataFrame
+    posicion_seleccionada = POSICIONES_POR_TRADUCCION.get(posicion_traducida, posicion_traducida)
+
+    # Mostrar contenido según la posición seleccionada: cada posición principal tiene su función de análisis
+    # y el DataFrame sobre el que se calcula (los porteros tienen su propia tabla de estadísticas)
+    analisis_por_posicion = {
+        "Goalkeeper": (mostrar_analisis_porteros, df_porteros_liga),
+        "Defender": (mostrar_analisis_defensores, jugadores_por_posicion.get("Defender")),
+        "Midfielder": (mostrar_analisis_centrocampistas, jugadores_por_posicion.get("Midfielder")),
+        "Forward": (mostrar_analisis_delanteros, jugadores_por_posicion.get("Forward")),
+    }
+    if posicion_seleccionada in analisis_por_posicion:
+        mostrar_analisis, df_posicion = analisis_por_posicion[posicion_seleccionada]
+        mostrar_analisis(df_posicion)
         
 # Contenido de la pestaña de interpretación y conclusiones
 with tabs[4]: